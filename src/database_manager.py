@@ -31,9 +31,23 @@ class DatabaseManager:
     def connect(self):
         """Connect to the SQLite database."""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            # Autocommit at the driver level; transactions are explicit
+            self.conn = sqlite3.connect(
+                self.db_path, isolation_level=None, check_same_thread=False
+            )
             self.conn.row_factory = sqlite3.Row
             self.cursor = self.conn.cursor()
+
+            # Tune SQLite for the write-heavy pipeline workload
+            # (WAL is not available for in-memory databases)
+            if self.db_path != ':memory:':
+                self.cursor.execute("PRAGMA journal_mode=WAL")
+            self.cursor.execute("PRAGMA synchronous=NORMAL")
+            self.cursor.execute("PRAGMA temp_store=MEMORY")
+            self.cursor.execute("PRAGMA mmap_size=10737418240")
+            self.cursor.execute("PRAGMA cache_size=-65536")
+            self.cursor.execute("PRAGMA busy_timeout=5000")
+
             logger.info(f"Connected to database: {self.db_path}")
         except sqlite3.Error as e:
             logger.error(f"Database connection error: {e}")
@@ -45,6 +59,19 @@ class DatabaseManager:
             self.conn.close()
             logger.info("Database connection closed")
     
+    def begin(self):
+        """Begin an explicit transaction grouping several inserts."""
+        self.cursor.execute("BEGIN IMMEDIATE")
+    
+    def commit_tx(self):
+        """Commit the current transaction."""
+        self.cursor.execute("COMMIT")
+    
+    def rollback_tx(self):
+        """Roll back the current transaction, if one is active."""
+        if self.conn.in_transaction:
+            self.cursor.execute("ROLLBACK")
+    
     def initialize_database(self):
         """Create database tables if they don't exist."""
         try:
@@ -78,8 +105,18 @@ class DatabaseManager:
                 FOREIGN KEY (drug_id) REFERENCES drugs (id)
             )
             ''')
-            
-            self.conn.commit()
+
+            # Index foreign keys and filename lookups
+            self.cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_drugs_abstract ON drugs (abstract_id)"
+            )
+            self.cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_attr_drug ON attributes (drug_id)"
+            )
+            self.cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_abstracts_filename ON abstracts (filename)"
+            )
+
             logger.info("Database tables initialized")
         except sqlite3.Error as e:
             logger.error(f"Error initializing database: {e}")
@@ -98,16 +135,15 @@ class DatabaseManager:
         """
         try:
             self.cursor.execute(
-                "INSERT INTO abstracts (filename, text) VALUES (?, ?)",
+                "INSERT INTO abstracts (filename, text) VALUES (?, ?) RETURNING id",
                 (filename, text)
             )
-            self.conn.commit()
-            abstract_id = self.cursor.lastrowid
-            logger.info(f"Inserted abstract ID {abstract_id} for {filename}")
+            abstract_id = self.cursor.fetchone()[0]
+            logger.debug("Inserted abstract ID %d for %s", abstract_id, filename)
             return abstract_id
         except sqlite3.Error as e:
             logger.error(f"Error inserting abstract: {e}")
-            self.conn.rollback()
+            self.rollback_tx()
             raise
     
     def insert_drug(self, name, abstract_id):
@@ -123,16 +159,45 @@ class DatabaseManager:
         """
         try:
             self.cursor.execute(
-                "INSERT INTO drugs (name, abstract_id) VALUES (?, ?)",
+                "INSERT INTO drugs (name, abstract_id) VALUES (?, ?) RETURNING id",
                 (name, abstract_id)
             )
-            self.conn.commit()
-            drug_id = self.cursor.lastrowid
-            logger.info(f"Inserted drug ID {drug_id} for {name}")
+            drug_id = self.cursor.fetchone()[0]
+            logger.debug("Inserted drug ID %d for %s", drug_id, name)
             return drug_id
         except sqlite3.Error as e:
             logger.error(f"Error inserting drug: {e}")
-            self.conn.rollback()
+            self.rollback_tx()
+            raise
+    
+    def insert_drugs_many(self, names, abstract_id):
+        """
+        Insert several drugs for an abstract in a single statement.
+        
+        Args:
+            names (list): The drug names
+            abstract_id (int): The abstract ID
+            
+        Returns:
+            list: IDs of the inserted drugs, in the same order as names
+        """
+        if not names:
+            return []
+        try:
+            # executemany() discards RETURNING rows, so use one multi-row INSERT
+            placeholders = ", ".join(["(?, ?)"] * len(names))
+            params = [value for name in names for value in (name, abstract_id)]
+            self.cursor.execute(
+                f"INSERT INTO drugs (name, abstract_id) VALUES {placeholders} RETURNING id",
+                params
+            )
+            # RETURNING order is unspecified, but ids are assigned in row order
+            drug_ids = sorted(row[0] for row in self.cursor.fetchall())
+            logger.debug("Inserted %d drugs for abstract ID %d", len(drug_ids), abstract_id)
+            return drug_ids
+        except sqlite3.Error as e:
+            logger.error(f"Error inserting drugs: {e}")
+            self.rollback_tx()
             raise
     
     def insert_attribute(self, drug_id, name, value):
@@ -149,11 +214,52 @@ class DatabaseManager:
                 "INSERT INTO attributes (drug_id, name, value) VALUES (?, ?, ?)",
                 (drug_id, name, value)
             )
-            self.conn.commit()
-            logger.debug(f"Inserted attribute {name}={value} for drug ID {drug_id}")
+            logger.debug("Inserted attribute %s=%s for drug ID %d", name, value, drug_id)
         except sqlite3.Error as e:
             logger.error(f"Error inserting attribute: {e}")
-            self.conn.rollback()
+            self.rollback_tx()
+            raise
+    
+    def insert_attributes_many(self, drug_id, pairs):
+        """
+        Insert several drug attributes into the database in one call.
+        
+        Args:
+            drug_id (int): The drug ID
+            pairs (list): List of (name, value) tuples
+        """
+        self.insert_attribute_rows([(drug_id, name, value) for name, value in pairs])
+    
+    def insert_attribute_rows(self, rows):
+        """
+        Insert attributes for any number of drugs in one call.
+        
+        Args:
+            rows (list): List of (drug_id, name, value) tuples
+        """
+        try:
+            self.cursor.executemany(
+                "INSERT INTO attributes (drug_id, name, value) VALUES (?, ?, ?)",
+                rows
+            )
+            logger.debug("Inserted %d attributes", len(rows))
+        except sqlite3.Error as e:
+            logger.error(f"Error inserting attributes: {e}")
+            self.rollback_tx()
+            raise
+    
+    def get_processed_filenames(self):
+        """
+        Get the filenames of all PDFs already stored in the database.
+        
+        Returns:
+            set: Set of processed PDF filenames
+        """
+        try:
+            self.cursor.execute("SELECT filename FROM abstracts")
+            return {row[0] for row in self.cursor.fetchall()}
+        except sqlite3.Error as e:
+            logger.error(f"Error getting processed filenames: {e}")
             raise
     
     def get_drugs_by_abstract(self, abstract_id):
@@ -195,3 +301,40 @@ class DatabaseManager:
         except sqlite3.Error as e:
             logger.error(f"Error getting attributes by drug: {e}")
             raise
+    
+    def get_drugs_with_attributes(self, abstract_id):
+        """
+        Get all drugs for an abstract together with their attributes.
+        
+        Args:
+            abstract_id (int): The abstract ID
+            
+        Returns:
+            dict: Mapping of drug ID to a dictionary with the drug 'name'
+                and its list of 'attributes' dictionaries
+        """
+        try:
+            self.cursor.execute(
+                """
+                SELECT d.id AS drug_id, d.name AS drug_name,
+                       a.name AS attr_name, a.value AS attr_value
+                FROM drugs d
+                LEFT JOIN attributes a ON a.drug_id = d.id
+                WHERE d.abstract_id = ?
+                ORDER BY d.id, a.id
+                """,
+                (abstract_id,)
+            )
+            drugs = {}
+            for row in self.cursor.fetchall():
+                drug = drugs.setdefault(
+                    row['drug_id'], {'name': row['drug_name'], 'attributes': []}
+                )
+                if row['attr_name'] is not None:
+                    drug['attributes'].append(
+                        {'name': row['attr_name'], 'value': row['attr_value']}
+                    )
+            return drugs
+        except sqlite3.Error as e:
+            logger.error(f"Error getting drugs with attributes: {e}")
+            raise
@@ -7,9 +7,50 @@ Validates and cleans JSON responses from the language model.
 import json
 import logging
 import re
+import fastjsonschema
+import orjson
 
 logger = logging.getLogger('drug_detective.json_validator')
 
+# Regex patterns used to clean and extract JSON, compiled once at import time
+_JSON_OBJ = re.compile(r"({[\s\S]*})")
+_UNQUOTED_KEY = re.compile(r'([{,])\s*([a-zA-Z0-9_]+)\s*:')
+_TRAILING_COMMA = re.compile(r',\s*([}\]])')
+_OUTER = re.compile(r'^[^{]*({[\s\S]*})[^}]*$')
+_CODEBLOCK = re.compile(r"```(?:json)?\s*([\s\S]*?)```")
+
+# Expected structure of the language model's drug response
+DRUG_SCHEMA = {
+    "type": "object",
+    "required": ["drugs"],
+    "properties": {
+        "drugs": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["drug_name", "attributes"],
+                "properties": {
+                    "drug_name": {"type": "string"},
+                    "attributes": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "required": ["attribute_name", "attribute_value"],
+                            "properties": {
+                                "attribute_name": {"type": "string"},
+                                "attribute_value": {"type": ["string", "number"]},
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+# Validator compiled once at import time
+_validate_drug_schema = fastjsonschema.compile(DRUG_SCHEMA)
+
 
 def validate_and_clean_json(json_text):
     """
@@ -21,44 +62,60 @@ def validate_and_clean_json(json_text):
     Returns:
         dict: Cleaned JSON object or None if invalid
     """
-    if not json_text:
+    stripped = json_text.strip() if json_text else ""
+    if not stripped:
         logger.error("Empty JSON text received")
         return None
     
-    # First attempt: Try to parse as-is
-    try:
-        json_obj = json.loads(json_text)
-        logger.info("JSON valid on first attempt")
-        return json_obj
-    except json.JSONDecodeError as e:
-        logger.warning(f"Initial JSON parsing failed: {e}")
+    # Fast path: response wrapped in a markdown code block
+    if stripped.startswith("```"):
+        json_obj = extract_json_from_code_block(stripped)
+        if json_obj is not None:
+            return json_obj
     
-    # Second attempt: Clean up the JSON text
+    # Fast path: response is a bare JSON object
+    elif stripped[0] == '{' and stripped[-1] == '}':
+        try:
+            json_obj = orjson.loads(stripped)
+            logger.info("JSON valid on first attempt")
+            return json_obj
+        except orjson.JSONDecodeError as e:
+            logger.warning(f"Initial JSON parsing failed: {e}")
+    
+    # Clean up the JSON text
     cleaned_text = clean_json_text(json_text)
     
     try:
-        json_obj = json.loads(cleaned_text)
+        json_obj = orjson.loads(cleaned_text)
         logger.info("JSON valid after cleaning")
         return json_obj
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"JSON parsing failed after cleaning: {e}")
+    
+    # Last attempt: Extract JSON within markdown code blocks
+    return extract_json_from_code_block(json_text)
+
+
+def extract_json_from_code_block(json_text):
+    """
+    Extract the first parseable JSON value from markdown code blocks.
+    
+    Args:
+        json_text (str): Text that may contain ```json ... ``` blocks
         
-        # Last attempt: Extract JSON within markdown code blocks
-        try:
-            # Extract JSON from markdown code blocks if present
-            json_pattern = r"```(?:json)?\s*([\s\S]*?)```"
-            matches = re.findall(json_pattern, json_text)
-            
-            if matches:
-                for match in matches:
-                    try:
-                        json_obj = json.loads(match)
-                        logger.info("JSON extracted from code block")
-                        return json_obj
-                    except:
-                        continue
-        except Exception as e:
-            logger.error(f"Failed to extract JSON from markdown: {e}")
+    Returns:
+        dict: Parsed JSON object or None if no block parses
+    """
+    try:
+        for match in _CODEBLOCK.findall(json_text):
+            try:
+                json_obj = json.loads(match)
+                logger.info("JSON extracted from code block")
+                return json_obj
+            except json.JSONDecodeError:
+                continue
+    except Exception as e:
+        logger.error(f"Failed to extract JSON from markdown: {e}")
     
     return None
 
@@ -74,8 +131,7 @@ def clean_json_text(json_text):
         str: Cleaned JSON text
     """
     # Remove any leading/trailing text
-    json_pattern = r"({[\s\S]*})"
-    matches = re.search(json_pattern, json_text)
+    matches = _JSON_OBJ.search(json_text)
     if matches:
         json_text = matches.group(1)
     
@@ -83,13 +139,13 @@ def clean_json_text(json_text):
     json_text = json_text.replace("'", '"')
     
     # Fix unquoted keys
-    json_text = re.sub(r'([{,])\s*([a-zA-Z0-9_]+)\s*:', r'\1"\2":', json_text)
+    json_text = _UNQUOTED_KEY.sub(r'\1"\2":', json_text)
     
     # Fix trailing commas
-    json_text = re.sub(r',\s*([}\]])', r'\1', json_text)
+    json_text = _TRAILING_COMMA.sub(r'\1', json_text)
     
     # Remove additional characters outside the JSON object
-    json_text = re.sub(r'^[^{]*({[\s\S]*})[^}]*$', r'\1', json_text)
+    json_text = _OUTER.sub(r'\1', json_text)
     
     logger.debug("JSON text cleaned")
     return json_text
@@ -105,47 +161,39 @@ def validate_drug_structure(json_obj):
     Returns:
         bool: True if valid, False otherwise
     """
-    if not isinstance(json_obj, dict):
-        logger.error("JSON is not a dictionary")
+    try:
+        _validate_drug_schema(json_obj)
+    except fastjsonschema.JsonSchemaException as e:
+        logger.error(f"Drug JSON structure validation failed: {e}")
         return False
     
-    if 'drugs' not in json_obj:
-        logger.error("'drugs' key not found in JSON")
-        return False
+    logger.info("Drug JSON structure validation passed")
+    return True
+
+
+def extract_drugs(json_obj):
+    """
+    Collect the drugs and attributes to store from a validated response.
     
-    if not isinstance(json_obj['drugs'], list):
-        logger.error("'drugs' is not a list")
-        return False
+    Drugs with an empty name and attributes with an empty name or value
+    are skipped.
     
-    for i, drug in enumerate(json_obj['drugs']):
-        if not isinstance(drug, dict):
-            logger.error(f"Drug at index {i} is not a dictionary")
-            return False
-        
-        if 'drug_name' not in drug:
-            logger.error(f"Drug at index {i} has no 'drug_name'")
-            return False
-        
-        if 'attributes' not in drug:
-            logger.error(f"Drug at index {i} has no 'attributes'")
-            return False
+    Args:
+        json_obj (dict): JSON object that passed validate_drug_structure
         
-        if not isinstance(drug['attributes'], list):
-            logger.error(f"Drug at index {i} 'attributes' is not a list")
-            return False
+    Returns:
+        list: List of (drug_name, [(attribute_name, attribute_value), ...]) tuples
+    """
+    drugs = []
+    for i, drug in enumerate(json_obj['drugs']):
+        if not drug['drug_name']:
+            logger.warning(f"Skipping drug at index {i}: empty 'drug_name'")
+            continue
         
-        for j, attr in enumerate(drug['attributes']):
-            if not isinstance(attr, dict):
-                logger.error(f"Attribute at index {j} for drug {i} is not a dictionary")
-                return False
-            
-            if 'attribute_name' not in attr:
-                logger.error(f"Attribute at index {j} for drug {i} has no 'attribute_name'")
-                return False
-            
-            if 'attribute_value' not in attr:
-                logger.error(f"Attribute at index {j} for drug {i} has no 'attribute_value'")
-                return False
+        drugs.append((drug['drug_name'], [
+            (attr['attribute_name'], attr['attribute_value'])
+            for attr in drug['attributes']
+            if attr['attribute_name'] and attr['attribute_value']
+        ]))
     
-    logger.info("Drug JSON structure validation passed")
-    return True
+    return drugs
@@ -6,6 +6,7 @@ Handles integration with language models for text processing.
 
 import os
 import logging
+import threading
 import openai
 from openai import OpenAI
 from dotenv import load_dotenv
@@ -19,17 +20,8 @@ logger = logging.getLogger('drug_detective.llm_processor')
 OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
 
 
-def build_prompt(text):
-    """
-    Build a prompt for the language model.
-    
-    Args:
-        text (str): The abstract text to analyze
-        
-    Returns:
-        str: Formatted prompt
-    """
-    prompt = """
+# Static parts of the prompt, built once at import time
+_PROMPT_PREFIX = """
 The following abstract was extracted from a scientific article:
 
 Categories and attributes to extract:
@@ -40,9 +32,8 @@ Categories and attributes to extract:
 
 Abstract Text:
 """
-    prompt += text
-    
-    prompt += """
+
+_PROMPT_SUFFIX = """
 
 Respond ONLY with a JSON object in the following format:
 {
@@ -62,7 +53,47 @@ Respond ONLY with a JSON object in the following format:
 }
 
 """
-    return prompt
+
+# Shared client so HTTP connections are reused across calls; created on
+# first use so a construction error is logged like any other API error
+_client = None
+_client_lock = threading.Lock()
+
+# Output token cap. One drug with all 28 attributes and long values is
+# ~1600 tokens in the prompt's indented format, so this fits two drugs.
+# Completion token counts are logged so the cap can be tuned from real runs.
+MAX_RESPONSE_TOKENS = 3200
+
+# Cap on concurrent in-flight requests to the OpenAI API
+MAX_CONCURRENT_REQUESTS = 8
+_request_slots = threading.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+
+def build_prompt(text):
+    """
+    Build a prompt for the language model.
+    
+    Args:
+        text (str): The abstract text to analyze
+        
+    Returns:
+        str: Formatted prompt
+    """
+    return f"{_PROMPT_PREFIX}{text}{_PROMPT_SUFFIX}"
+
+
+def get_client():
+    """
+    Get the shared OpenAI client, creating it on first use.
+    
+    Returns:
+        OpenAI: The shared client
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OpenAI(api_key=OPENAI_API_KEY)
+        return _client
 
 
 def process_text_with_llm(text):
@@ -80,9 +111,6 @@ def process_text_with_llm(text):
         return None
     
     try:
-        # Initialize OpenAI client
-        client = OpenAI(api_key=OPENAI_API_KEY)
-        
         # Build the prompt
         prompt = build_prompt(text)
         
@@ -90,19 +118,34 @@ def process_text_with_llm(text):
         logger.info(f"Sending prompt to LLM (length: {len(prompt)} characters)")
         
         # Call the OpenAI API
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are a scientific assistant extracting drug information from abstracts."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0,  # Use deterministic output for consistency
-            max_tokens=2000
-        )
+        with _request_slots:
+            response = get_client().chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": "You are a scientific assistant extracting drug information from abstracts."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0,  # Use deterministic output for consistency
+                max_tokens=MAX_RESPONSE_TOKENS,
+                response_format={"type": "json_object"}  # Constrain output to a JSON object
+            )
+        
+        # A response cut off at the token cap is incomplete JSON
+        choice = response.choices[0]
+        if choice.finish_reason == "length":
+            logger.error(
+                f"LLM response truncated at max_tokens={MAX_RESPONSE_TOKENS}; "
+                "discarding incomplete JSON"
+            )
+            return None
         
         # Extract and return response content
-        content = response.choices[0].message.content
-        logger.info(f"Received response from LLM (length: {len(content)} characters)")
+        content = choice.message.content
+        completion_tokens = response.usage.completion_tokens if response.usage else None
+        logger.info(
+            f"Received response from LLM (length: {len(content)} characters, "
+            f"{completion_tokens} completion tokens)"
+        )
         return content
         
     except Exception as e:
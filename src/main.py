@@ -5,14 +5,14 @@ This script orchestrates the entire pipeline for extracting drug information fro
 """
 
 import os
-import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from pdf_extractor import extract_text_from_pdfs
 from database_manager import DatabaseManager
 from llm_processor import process_text_with_llm
-from json_validator import validate_and_clean_json
+from json_validator import validate_and_clean_json, validate_drug_structure, extract_drugs
 
 # Configure logging
 os.makedirs("./logs", exist_ok=True)
@@ -25,31 +25,10 @@ logger = logging.getLogger('drug_detective')
 
 # Configuration
 PDF_FOLDER = "./data/pdf_abstracts"
-PROCESSED_LOG = "./data/processed_pdfs.json"
 LOG_FILE = "./logs/drug_detective.log"
 DB_FOLDER = "./database"
 DB_PATH = os.path.join(DB_FOLDER, "drug_detective.db")
-
-
-def load_processed_files():
-    """Load the list of already processed PDF files."""
-    try:
-        if os.path.exists(PROCESSED_LOG):
-            with open(PROCESSED_LOG, 'r') as f:
-                return json.load(f)
-        return []
-    except Exception as e:
-        logger.error(f"Error loading processed files: {e}")
-        return []
-
-
-def save_processed_files(processed):
-    """Save the updated list of processed PDF files."""
-    try:
-        with open(PROCESSED_LOG, 'w') as f:
-            json.dump(processed, f, indent=2)
-    except Exception as e:
-        logger.error(f"Error saving processed files: {e}")
+LLM_WORKERS = 8
 
 
 def main():
@@ -64,8 +43,8 @@ def main():
     db = DatabaseManager(DB_PATH)
     db.initialize_database()
     
-    # Get list of already processed files
-    processed_files = load_processed_files()
+    # Get the set of already processed files
+    processed_files = db.get_processed_filenames()
     
     # Extract text from new PDFs
     pdf_data = extract_text_from_pdfs(PDF_FOLDER, processed_files)
@@ -74,53 +53,58 @@ def main():
         logger.info("No new PDFs to process")
         return
     
-    # Track newly processed files
+    # Track files processed in this run
     newly_processed = []
     
-    # Process each PDF
-    for pdf_file, text in pdf_data:
+    # Process PDFs with the LLM concurrently, storing each result in order
+    # as soon as it arrives so finished PDFs are committed straight away
+    logger.info(f"Sending {len(pdf_data)} PDFs to the LLM")
+    with ThreadPoolExecutor(max_workers=LLM_WORKERS) as executor:
+        llm_responses = executor.map(process_text_with_llm, [text for _, text in pdf_data])
         try:
-            logger.info(f"Processing {pdf_file}")
-            
-            # Store abstract in database
-            abstract_id = db.insert_abstract(pdf_file, text)
-            
-            # Process with LLM
-            llm_response = process_text_with_llm(text)
-            
-            # Validate and clean JSON
-            valid_json = validate_and_clean_json(llm_response)
-            
-            if not valid_json:
-                logger.error(f"Invalid JSON response for {pdf_file}")
-                continue
-            
-            # Store drug information in database
-            for drug in valid_json.get('drugs', []):
-                drug_name = drug.get('drug_name')
-                if not drug_name:
-                    continue
-                
-                # Insert drug and get its ID
-                drug_id = db.insert_drug(drug_name, abstract_id)
-                
-                # Insert drug attributes
-                for attr in drug.get('attributes', []):
-                    attr_name = attr.get('attribute_name')
-                    attr_value = attr.get('attribute_value')
-                    if attr_name and attr_value:
-                        db.insert_attribute(drug_id, attr_name, attr_value)
-            
-            # Mark file as processed
-            newly_processed.append(pdf_file)
-            logger.info(f"Successfully processed {pdf_file}")
-            
-        except Exception as e:
-            logger.error(f"Error processing {pdf_file}: {e}")
-    
-    # Update processed files list
-    processed_files.extend(newly_processed)
-    save_processed_files(processed_files)
+            for (pdf_file, text), llm_response in zip(pdf_data, llm_responses):
+                try:
+                    logger.info(f"Processing {pdf_file}")
+                    
+                    # Validate and clean JSON
+                    valid_json = validate_and_clean_json(llm_response)
+
+                    if not valid_json or not validate_drug_structure(valid_json):
+                        logger.error(f"Invalid JSON response for {pdf_file}")
+                        continue
+
+                    # Store all of this PDF's rows in a single transaction
+                    db.begin()
+                    try:
+                        # Store abstract in database
+                        abstract_id = db.insert_abstract(pdf_file, text)
+
+                        # Store drug information in database
+                        drugs = extract_drugs(valid_json)
+                        drug_ids = db.insert_drugs_many([name for name, _ in drugs], abstract_id)
+
+                        # Store all drug attributes in one batch
+                        db.insert_attribute_rows([
+                            (drug_id, attr_name, attr_value)
+                            for drug_id, (_, attributes) in zip(drug_ids, drugs)
+                            for attr_name, attr_value in attributes
+                        ])
+
+                        db.commit_tx()
+                    except Exception:
+                        db.rollback_tx()
+                        raise
+
+                    # The committed abstract row marks the file as processed
+                    newly_processed.append(pdf_file)
+                    logger.info(f"Successfully processed {pdf_file}")
+                    
+                except Exception as e:
+                    logger.error(f"Error processing {pdf_file}: {e}")
+        except BaseException:
+            # Don't pay for queued LLM calls whose results would be discarded
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
     
     logger.info(f"Pipeline complete. Processed {len(newly_processed)} new PDFs.")
 
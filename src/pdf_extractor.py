@@ -6,7 +6,9 @@ Extracts text from PDF files in a specified directory.
 
 import os
 import logging
-import PyPDF2
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import pypdfium2 as pdfium
 
 logger = logging.getLogger('drug_detective.pdf_extractor')
 
@@ -22,25 +24,90 @@ def extract_text_from_pdf(pdf_path):
         str: Extracted text from the PDF
     """
     try:
-        text = ""
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            for page_num in range(len(reader.pages)):
-                page = reader.pages[page_num]
-                text += page.extract_text() + "\n"
-        return text
+        parts = []
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            for page_num, page in enumerate(pdf):
+                try:
+                    parts.append(page.get_textpage().get_text_range())
+                except Exception as e:
+                    logger.warning(f"Error extracting page {page_num} of {pdf_path}: {e}")
+        finally:
+            pdf.close()
+        return "\n".join(parts)
     except Exception as e:
         logger.error(f"Error extracting text from {pdf_path}: {e}")
         return ""
 
 
+def _run_in_pool(pdf_paths, workers):
+    """
+    Extract text from PDFs in one process pool.
+    
+    Args:
+        pdf_paths (list): Paths to the PDF files
+        workers (int): Number of worker processes
+        
+    Returns:
+        tuple: (dict of path to text for finished files,
+                list of paths lost because the pool broke)
+    """
+    texts = {}
+    lost = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for path in pdf_paths:
+            try:
+                futures[path] = executor.submit(extract_text_from_pdf, path)
+            except BrokenProcessPool:
+                lost.append(path)
+        
+        for path, future in futures.items():
+            try:
+                texts[path] = future.result()
+            except BrokenProcessPool:
+                lost.append(path)
+            except Exception as e:
+                logger.error(f"Error extracting text from {path}: {e}")
+                texts[path] = ""
+    return texts, lost
+
+
+def extract_texts_in_processes(pdf_paths):
+    """
+    Extract text from several PDF files in parallel worker processes.
+    
+    A worker that dies (e.g. a crash in native PDF code) breaks the whole
+    pool, so the files it took down are retried one per fresh pool. Only
+    the file that actually crashes is skipped.
+    
+    Args:
+        pdf_paths (list): Paths to the PDF files
+        
+    Returns:
+        list: Extracted text for each path, in order ("" if extraction failed)
+    """
+    workers = min(len(pdf_paths), os.cpu_count() or 1)
+    texts, lost = _run_in_pool(pdf_paths, workers)
+    
+    if lost:
+        logger.warning(f"PDF worker pool broke; retrying {len(lost)} files one at a time")
+    for path in lost:
+        retry_texts, crashed = _run_in_pool([path], 1)
+        if crashed:
+            logger.error(f"Worker crashed extracting text from {path}; skipping")
+        texts[path] = retry_texts.get(path, "")
+    
+    return [texts[path] for path in pdf_paths]
+
+
 def extract_text_from_pdfs(folder_path, processed_files):
     """
     Scan a folder for new PDF files and extract text from them.
     
     Args:
         folder_path (str): Path to the folder containing PDF files
-        processed_files (list): List of already processed PDF files
+        processed_files (iterable): Already processed PDF filenames
         
     Returns:
         list: List of tuples containing (pdf_file, extracted_text)
@@ -57,7 +124,8 @@ def extract_text_from_pdfs(folder_path, processed_files):
         pdf_files = [f for f in os.listdir(folder_path) if f.lower().endswith('.pdf')]
         
         # Filter for new files
-        new_files = [f for f in pdf_files if f not in processed_files]
+        processed_set = set(processed_files)
+        new_files = [f for f in pdf_files if f not in processed_set]
         
         if not new_files:
             logger.info("No new PDF files found")
@@ -65,11 +133,11 @@ def extract_text_from_pdfs(folder_path, processed_files):
         
         logger.info(f"Found {len(new_files)} new PDF files to process")
         
-        # Process each new file
-        for pdf_file in new_files:
-            pdf_path = os.path.join(folder_path, pdf_file)
-            text = extract_text_from_pdf(pdf_path)
-            
+        # Extract text from the new files in parallel worker processes
+        pdf_paths = [os.path.join(folder_path, f) for f in new_files]
+        texts = extract_texts_in_processes(pdf_paths)
+        
+        for pdf_file, text in zip(new_files, texts):
             if text:
                 results.append((pdf_file, text))
                 logger.info(f"Successfully extracted text from {pdf_file}")